@@ -0,0 +1,207 @@
+import os
+import re
+import json
+import math
+from collections import Counter
+from atomic_io import atomic_write  # 导入原子写入
+
+# 配置
+ARTICLES_DIR = 'articles'
+ARTICLE_INDEX_FILE = 'articles_index.json'  # 文章标题/关键词缓存，按文件大小和修改时间判断是否失效
+ARTICLE_INDEX_VERSION = 2
+RELATED_ARTICLES_LIMIT = 3  # 每篇文章推荐的相关文章数量
+
+# 关键词提取
+MAX_KEYWORDS = 30  # 每篇文章最多保留的关键词数量
+MAX_PHRASE_KEYWORDS = 20  # 其中来自h2/h3/strong短语的最多数量，其余名额留给正文高频词
+MAX_KEYWORD_LENGTH = 20  # 超过该长度的"关键词"视为整段文字
+MIN_TERM_COUNT = 2  # 正文中的词至少出现的次数
+
+PHRASE_PATTERN = re.compile(r'<(h2|h3|strong)\b[^>]*>(.*?)</\1>', re.IGNORECASE | re.DOTALL)
+PARAGRAPH_PATTERN = re.compile(r'<p\b[^>]*>(.*?)</p>', re.IGNORECASE | re.DOTALL)
+TAG_PATTERN = re.compile(r'<[^>]*>')
+TOKEN_PATTERN = re.compile(r'[\u4e00-\u9fff]+|[A-Za-z][A-Za-z0-9+#]*')
+CJK_PATTERN = re.compile(r'[\u4e00-\u9fff]')
+
+# 中文二元组中出现这些字时跳过（虚词、代词、量词等）
+STOP_CHARS = set('的了和与及或也都就而其为对将把被从以之这那有是在我你您他她它们个等些更很最并且如果可以一')
+
+# 停用词：英文虚词、中文常见动词二元组和页面通用标题
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it',
+    'of', 'on', 'or', 'that', 'the', 'this', 'to', 'with', 'your', 'you', 'we', 'our',
+    '确保', '能够', '包括', '提供', '通过', '进行', '帮助', '实现', '需要', '以及', '我们', '可以',
+    'copy', '结论', '服务', '快速链接', '相关文章', '相关推荐', '订阅我们', '扫描二维码添加微信'
+}
+
+def normalize_path(path):
+    """统一路径分隔符"""
+    return os.path.normpath(path).replace('\\', '/')
+
+def iter_phrases(content):
+    """逐个产出 h2/h3/strong 中的文本，作为候选短语"""
+    for match in PHRASE_PATTERN.finditer(content):
+        text = TAG_PATTERN.sub('', match.group(2))
+        if text:
+            yield text
+
+def iter_paragraphs(content):
+    """逐个产出段落文本，用于统计词频"""
+    for match in PARAGRAPH_PATTERN.finditer(content):
+        text = TAG_PATTERN.sub('', match.group(1))
+        if text:
+            yield text
+
+def iter_ngrams(text):
+    """从一段文本中流式产出候选词：中文按字符二元组切分，英文按单词切分，跳过停用词"""
+    for match in TOKEN_PATTERN.finditer(text):
+        token = match.group(0)
+        if CJK_PATTERN.match(token):
+            for i in range(len(token) - 1):
+                bigram = token[i:i+2]
+                if not STOP_CHARS.intersection(bigram) and bigram not in STOPWORDS:
+                    yield bigram
+        elif len(token) > 1 and token.lower() not in STOPWORDS:
+            yield token
+
+def clean_phrase(text):
+    """清理标题类短语：去掉序号和标点，过长或为停用词时返回None"""
+    phrase = re.sub(r'[^\w\s]', '', text)
+    phrase = re.sub(r'^\d+\s+', '', phrase)
+    phrase = re.sub(r'\s+', ' ', phrase).strip()
+    if len(phrase) < 2 or len(phrase) > MAX_KEYWORD_LENGTH or phrase.lower() in STOPWORDS:
+        return None
+    return phrase
+
+def extract_keywords(content, limit=MAX_KEYWORDS):
+    """从文章内容中提取关键词，返回按频率排序、最多limit个的列表
+
+    h2/h3/strong 中的短语整体作为关键词（最多MAX_PHRASE_KEYWORDS个，按出现次数和先后排序），
+    剩余名额给正文中出现次数最多的中文二元组和英文单词。全程边扫描边计数，不拼接全文。
+    """
+    phrase_counts = Counter(phrase for phrase in map(clean_phrase, iter_phrases(content)) if phrase)
+    term_counts = Counter(term for text in iter_paragraphs(content) for term in iter_ngrams(text))
+
+    # 次数相同时短语保持在文中出现的先后顺序，正文词按字典序，保证结果稳定
+    phrases = sorted(phrase_counts, key=lambda phrase: -phrase_counts[phrase])[:min(limit, MAX_PHRASE_KEYWORDS)]
+    keywords = list(phrases)
+    chosen = set(keywords)
+    terms = sorted(
+        (term for term, count in term_counts.items() if count >= MIN_TERM_COUNT and term not in chosen),
+        key=lambda term: (-term_counts[term], term)
+    )
+    keywords.extend(terms[:limit - len(keywords)])
+    return keywords
+
+def is_bloated_keywords(keywords):
+    """旧版提取器生成的关键词列表：数量超过上限或包含整段文字"""
+    return len(keywords) > MAX_KEYWORDS or any(len(keyword) > MAX_KEYWORD_LENGTH for keyword in keywords)
+
+def extract_title(content):
+    """提取文章的<h1>标题"""
+    title_match = re.search(r'<h1>(.*?)</h1>', content)
+    return title_match.group(1) if title_match else None
+
+def load_index_cache():
+    """读取持久化的文章缓存，版本不符或损坏时返回空缓存"""
+    if os.path.exists(ARTICLE_INDEX_FILE):
+        try:
+            with open(ARTICLE_INDEX_FILE, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('version') == ARTICLE_INDEX_VERSION:
+                return cache
+        except (OSError, ValueError):
+            pass
+    return {'version': ARTICLE_INDEX_VERSION, 'articles': {}}
+
+def save_index_cache(cache):
+    """原子写入文章缓存"""
+    atomic_write(ARTICLE_INDEX_FILE, json.dumps(cache, ensure_ascii=False, indent=2, sort_keys=True))
+
+def load_article_entry(article_path, cached):
+    """返回文章的缓存条目（标题和提取出的关键词），文件大小或修改时间变化时重新读取"""
+    stat = os.stat(article_path)
+    if cached and cached.get('size') == stat.st_size and cached.get('mtime_ns') == stat.st_mtime_ns:
+        return cached, False
+    with open(article_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    entry = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'title': extract_title(content),
+        'keywords': extract_keywords(content)
+    }
+    return entry, True
+
+def build_article_index(all_articles, persist=True):
+    """建立文章索引：文件名 -> {标题, 关键词}，以及 关键词 -> 文件列表 的倒排索引和各关键词的IDF权重
+
+    标题和提取出的关键词缓存在 ARTICLE_INDEX_FILE 中，只有变化过的文章才会被重新读取；
+    配置中缺少关键词或关键词过长过多的文章用缓存中提取出的关键词替换。
+    """
+    cache = load_index_cache()
+    cached_articles = cache['articles']
+    fresh_articles = {}
+    cache_changed = False
+
+    articles = {}
+    postings = {}
+    for article in all_articles:
+        article_path = normalize_path(os.path.join(ARTICLES_DIR, article['file']))
+        if not os.path.exists(article_path):
+            continue
+        entry, reread = load_article_entry(article_path, cached_articles.get(article['file']))
+        cache_changed = cache_changed or reread
+        fresh_articles[article['file']] = entry
+        # 配置中没有关键词或仍是旧版提取器留下的整段文字时，换成新提取的关键词
+        if not article.get('keywords') or is_bloated_keywords(article['keywords']):
+            article['keywords'] = list(entry['keywords'])
+        keywords = set(article['keywords'])
+        articles[article['file']] = {'title': entry['title'], 'keywords': keywords}
+        for keyword in keywords:
+            postings.setdefault(keyword, []).append(article['file'])
+
+    # 删除已不在配置中的文章
+    cache_changed = cache_changed or set(fresh_articles) != set(cached_articles)
+    if persist and cache_changed:
+        cache['articles'] = fresh_articles
+        save_index_cache(cache)
+
+    # 平滑IDF：出现在越少文章中的关键词权重越高
+    total = len(articles)
+    idf = {keyword: math.log((total + 1) / (len(files) + 1)) + 1 for keyword, files in postings.items()}
+
+    return {'articles': articles, 'postings': postings, 'idf': idf}
+
+def find_related_articles(article_index, article_file, keywords, limit=RELATED_ARTICLES_LIMIT):
+    """通过倒排索引查找与给定关键词最相关的文章
+
+    只访问与当前文章至少共享一个关键词的文章；相关度是共享关键词的IDF之和，
+    得分相同时按配置中的文章顺序排列。没有标题的文章不会被推荐。
+    """
+    articles = article_index['articles']
+    postings = article_index['postings']
+    idf = article_index['idf']
+    scores = {}
+    common = {}
+    for keyword in set(keywords):
+        for other_file in postings.get(keyword, ()):
+            if other_file == article_file:
+                continue
+            scores[other_file] = scores.get(other_file, 0.0) + idf[keyword]
+            common[other_file] = common.get(other_file, 0) + 1
+
+    order = {name: position for position, name in enumerate(articles)}
+    ranked = sorted(
+        (name for name in scores if articles[name]['title']),
+        key=lambda name: (-round(scores[name], 9), order[name])
+    )
+    return [
+        {
+            'file': name,
+            'title': articles[name]['title'],
+            'score': scores[name],
+            'common_keywords': common[name]
+        }
+        for name in ranked[:limit]
+    ]